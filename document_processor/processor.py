@@ -1,10 +1,67 @@
+import asyncio
+import hashlib
+import json
+import mmap
+import multiprocessing
+import operator
+import os
+import queue
+import shutil
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import singledispatch
+from itertools import repeat
 from pathlib import Path
-from PyPDF2 import PdfReader
+import pymupdf
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
 
 
 from .exceptions import ImageExtractionError
 
 
+_PIPELINE_QUEUE_SIZE = 4
+_PIPELINE_DONE = object()
+
+_IMAGE_QUEUE_SIZE = 32
+
+_META_KEYS = ('title', 'author', 'subject', 'producer', 'creator')
+_META_GETTER = operator.itemgetter(*_META_KEYS)
+
+_cache_dir = Path('~/.document_processor/cache').expanduser()
+
+_IO_QUEUE_DEPTH = 8
+_io_executor = None
+_io_executor_lock = threading.Lock()
+
+
+def _reset_io_executor():
+    global _io_executor, _io_executor_lock
+    _io_executor = None
+    _io_executor_lock = threading.Lock()
+
+
+# Threads do not survive fork, so worker processes must build their own pool, and the 
+# lock may have been copied while another thread held it.
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_io_executor)
+
+
+def _get_io_executor() -> ThreadPoolExecutor:
+    """
+    Return the shared thread pool used to submit image writes in batches.
+    """
+    global _io_executor
+    with _io_executor_lock:
+        if _io_executor is None:
+            _io_executor = ThreadPoolExecutor(max_workers=_IO_QUEUE_DEPTH, thread_name_prefix="document_processor_io")
+        return _io_executor
+
+
 def get_document(document_path: Path | str):
     """
     Retrieve a document from the specified path.
@@ -41,22 +98,48 @@ def get_document(document_path: Path | str):
     ...
     FileNotFoundError: File nonexistent.txt not found
     """
+    return _stat_document(document_path)[0]
+
+
+
+def _stat_document(document_path: Path | str) -> tuple[Path, os.stat_result]:
+    """
+    Check that a document exists with a single `os.stat` and return its path and stat result.
+
+    The stat result is passed on to `_open_document` and `_document_digest` so that neither 
+    needs to stat the file again.
+    """
     if isinstance(document_path, str):
         document_path = Path(document_path)
-    if not document_path.exists():
+    try:
+        st = os.stat(document_path)
+    except (FileNotFoundError, NotADirectoryError):
         raise FileNotFoundError(f"File {document_path} not found")
-    return document_path
+    return document_path, st
+
+
+
+def _file_identity(st: os.stat_result) -> tuple:
+    """
+    Return the fields of a stat result that change when a file is replaced or rewritten.
+    """
+    return st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns
 
 
 
 
-def read_document(document_path: Path) -> PdfReader:
+def read_document(document_path: Path) -> pymupdf.Document:
     """
     Read a PDF document from the specified path.
 
     This function uses the `get_document` function to ensure the document path exists.
-    It then attempts to read the PDF document using `PdfReader`. If an error occurs 
-    during reading, it prints an error message and returns `None`.
+    It then opens the PDF document with PyMuPDF, which reads the file on demand (the 
+    trailer, the xref and the objects of the pages being extracted) rather than loading 
+    it into memory. The file is deliberately not memory-mapped: a mapped file that is 
+    truncated or rewritten while the document is open crashes the interpreter with 
+    SIGBUS, whereas read errors on an opened file are raised as exceptions. If an error 
+    occurs during reading, or the document is password-protected, it prints an error 
+    message and returns `None`.
 
     Parameters:
     -----------
@@ -65,8 +148,8 @@ def read_document(document_path: Path) -> PdfReader:
 
     Returns:
     --------
-    PdfReader or None
-        A `PdfReader` object if the document is successfully read, otherwise `None`.
+    pymupdf.Document or None
+        A `pymupdf.Document` object if the document is successfully read, otherwise `None`.
 
     Raises:
     -------
@@ -76,35 +159,59 @@ def read_document(document_path: Path) -> PdfReader:
     Examples:
     ---------
     >>> read_document(Path("example.pdf"))
-    <PdfReader object>
+    Document('example.pdf')
 
     >>> read_document(Path("nonexistent.pdf"))
     Error reading document: [Error message]
     None
     """
-    document_path = get_document(document_path)
+    return _open_document(*_stat_document(document_path))
+
+
+
+def _open_document(document_path: Path, st: os.stat_result) -> pymupdf.Document:
+    """
+    Open a document whose path and stat result were obtained from `_stat_document`.
+
+    See `read_document`; the known size is used to reject empty files up front. The 
+    identity of the opened file is remembered on the document so that the page cache 
+    can tell later whether the file on disk is still the one that was opened.
+    """
+    if st.st_size == 0:
+        print(f"Error reading document: {document_path} is empty")
+        return None
     try:
-        reader = PdfReader(document_path)   
+        reader = pymupdf.open(document_path, filetype="pdf")
     except Exception as e:
         print(f"Error reading document: {e}")
         return None
+    if reader.needs_pass:
+        print(f"Error reading document: {document_path} is password-protected")
+        reader.close()
+        return None
+    reader._docproc_identity = _file_identity(st)
     return reader
 
 
 
-def get_document_meta_data(document: Path | PdfReader) -> dict:
+@singledispatch
+def get_document_meta_data(document: Path | pymupdf.Document) -> dict:
     """
     Retrieve metadata from a PDF document.
 
-    This function accepts a PDF document as either a `Path` object or a `PdfReader` object.
-    If a `Path` object is provided, it uses the `get_document` and `read_document` functions
-    to ensure the document exists and to read the document. It then extracts and returns 
-    metadata from the PDF document.
+    This function accepts a PDF document as either a `Path` object or a `pymupdf.Document` object.
+    If a `Path` object (or a string) is provided, it uses the `read_document` function to 
+    open the document, reads only the trailer information (the `/Info` dictionary and the 
+    `/Pages /Count` entry) without loading any page, and closes the document again.
+    It then extracts and returns metadata from the PDF document. The function dispatches
+    on the type of `document`, so paths and documents are handled by separate 
+    implementations rather than by `isinstance` checks. As a consequence `document` must 
+    be passed positionally: `get_document_meta_data(document=reader)` raises `TypeError`.
 
     Parameters:
     -----------
-    document : Path or PdfReader
-        The path to the document as a `Path` object or a `PdfReader` object.
+    document : Path or pymupdf.Document
+        The path to the document as a `Path` object or a `pymupdf.Document` object.
 
     Returns:
     --------
@@ -118,7 +225,7 @@ def get_document_meta_data(document: Path | PdfReader) -> dict:
     {
         'num_pages': 10,
         'title': 'Example Title',
-        'author': 'Author Name',a
+        'author': 'Author Name',
         'subject': 'Example Subject',
         'producer': 'PDF Producer',
         'creator': 'PDF Creator'
@@ -134,46 +241,195 @@ def get_document_meta_data(document: Path | PdfReader) -> dict:
         'creator': 'PDF Creator'
     }
     """
-    if isinstance(document, Path):
-        document = get_document(document)
-        reader = read_document(document)
-    else:
-        reader = document
+    reader = document
+
+    meta_data = {'num_pages': reader.page_count}
+    meta_data.update(zip(_META_KEYS, _META_GETTER(reader.metadata)))
+
+    return meta_data
+
+
 
+@get_document_meta_data.register(Path)
+@get_document_meta_data.register(str)
+def _get_document_meta_data_from_path(document: Path | str) -> dict:
+    reader = read_document(document)
     if reader is None:
         return None
+    with reader:
+        return get_document_meta_data(reader)
 
-    meta_data = {}
-    data = reader.metadata
 
-    meta_data['num_pages'] = len(reader.pages)
-    meta_data['title'] = data.title
-    meta_data['author'] = data.author
-    meta_data['subject'] = data.subject
-    meta_data['producer'] = data.producer
-    meta_data['creator'] = data.creator
 
-    return meta_data
+@get_document_meta_data.register(type(None))
+def _get_document_meta_data_from_none(document: None) -> None:
+    return None
+
+
+
+def _document_digest(document_path: Path, size: int) -> str:
+    """
+    Hash the contents of a document, mapping the file instead of reading it into memory.
+
+    BLAKE3 is used when available: it hashes the mapped file with SIMD instructions. 
+    Its multi-threaded mode is deliberately not used, because BLAKE3's global worker 
+    pool does not survive `fork()` and would deadlock worker processes forked after a 
+    hash. Otherwise the document is hashed with SHA-256, which OpenSSL accelerates with 
+    the SHA extensions of recent CPUs.
+    """
+    if blake3 is not None:
+        return blake3.blake3().update_mmap(document_path).hexdigest()
+    if size == 0:
+        return hashlib.sha256().hexdigest()
+    with open(document_path, "rb") as fp:
+        with mmap.mmap(fp.fileno(), size, access=mmap.ACCESS_READ) as mapped:
+            return hashlib.sha256(mapped).hexdigest()
+
+
+
+def _safe_document_digest(document_path: Path, size: int) -> str | None:
+    """
+    Hash a document for the page cache, returning `None` if the file cannot be read.
+    """
+    try:
+        return _document_digest(document_path, size)
+    except OSError:
+        return None
+
+
+
+def _file_unchanged(document_path: Path, st: os.stat_result) -> bool:
+    """
+    Return whether the file at `document_path` is still the one described by `st`.
+    """
+    try:
+        return _file_identity(os.stat(document_path)) == _file_identity(st)
+    except OSError:
+        return False
+
+
+
+def _document_cache_digest(reader: pymupdf.Document) -> str | None:
+    """
+    Return the cache digest of an opened document, or `None` if it must not be cached.
+
+    The digest is computed once per document and kept on it. Only documents opened by 
+    `read_document` are cached, since only for those is the identity of the opened 
+    file known. The cache is skipped when the document has unsaved changes, when its 
+    file cannot be stat'ed, or when the file on disk has been replaced or rewritten 
+    since the document was opened: in all of these cases the file's contents no longer 
+    describe the document.
+    """
+    identity = getattr(reader, '_docproc_identity', None)
+    if identity is None or not reader.name or reader.is_dirty:
+        return None
+    try:
+        if _file_identity(os.stat(reader.name)) != identity:
+            return None
+    except OSError:
+        return None
+
+    digest = getattr(reader, '_docproc_digest', None)
+    if digest is None:
+        digest = _safe_document_digest(Path(reader.name), identity[2])
+        try:
+            # The file may have been replaced while it was being hashed.
+            if _file_identity(os.stat(reader.name)) != identity:
+                return None
+        except OSError:
+            return None
+        reader._docproc_digest = digest
+    return digest
+
+
+
+def _load_cached_page(digest: str, page_number: int, storage_path: Path, extract_images: bool = True):
+    """
+    Return the cached extraction result of a page, or `None` on a cache miss.
+
+    The cached images are copied to the storage path so that callers get the same 
+    result as a fresh extraction. An entry whose images have disappeared from the cache,
+    or that was stored without images when images are requested, is treated as a miss.
+    """
+    entry_dir = _cache_dir / digest
+    try:
+        entry = json.loads((entry_dir / f"{page_number}.json").read_text())
+        if not extract_images:
+            return entry['text'], [], entry['meta_data']
+        if not entry['images_extracted']:
+            return None
+        cached_images = [entry_dir / str(page_number) / name for name in entry['images']]
+        if not all(image.exists() for image in cached_images):
+            return None
+        if cached_images:
+            storage_path.mkdir(parents=True, exist_ok=True)
+        images = [Path(shutil.copyfile(image, storage_path / image.name)) for image in cached_images]
+    except Exception:
+        return None
+    return entry['text'], images, entry['meta_data']
+
+
+
+def _store_cached_page(digest: str, page_number: int, result: tuple, extract_images: bool = True):
+    """
+    Store the extraction result of a page, and a copy of its images, in the cache.
+    """
+    text, images, meta_data = result
+    entry_dir = _cache_dir / digest
+    image_dir = entry_dir / str(page_number)
+    try:
+        image_dir.mkdir(parents=True, exist_ok=True)
+        for image in images:
+            shutil.copyfile(image, image_dir / image.name)
+        entry_path = entry_dir / f"{page_number}.json"
+        tmp_path = entry_dir / f"{page_number}.json.{os.getpid()}.tmp"
+        tmp_path.write_text(json.dumps({
+            'text': text,
+            'images': [image.name for image in images],
+            'meta_data': meta_data,
+            'images_extracted': extract_images,
+        }))
+        os.replace(tmp_path, entry_path)
+    except Exception as e:
+        print(f"Error writing cache: {e}")
 
 
 
-def extract_data_from_page(reader: PdfReader | Path, page_number: int, storage_path: Path =  Path('./images')):
+@singledispatch
+def extract_data_from_page(reader: pymupdf.Document | Path, page_number: int, storage_path: Path =  Path('./images'), force_refresh: bool = False, extract_images: bool = True):
     """
     Extract text and images from a specified page of a PDF document.
 
-    This function takes a `PdfReader` object and a page number, and extracts the text and 
+    This function takes a `pymupdf.Document` object and a page number, and extracts the text and 
     images from the specified page. It also retrieves the document metadata and includes 
     the page number in the metadata. If the page number is less than 1, it raises a 
-    `ValueError`. If the `PdfReader` object is `None`, it returns `None`.
+    `ValueError`. If the `pymupdf.Document` object is `None`, it returns `None`. A `Path` 
+    (or a string) may be given instead of a document, in which case the document is 
+    opened for this call only; the function dispatches on the type of `reader`, which 
+    must therefore be passed positionally: `extract_data_from_page(reader=doc, 
+    page_number=1)` raises `TypeError`.
+
+    Results are cached on disk under `~/.document_processor/cache`, keyed by a content 
+    hash of the document (BLAKE3, or SHA-256 as a fallback) and the page number, so 
+    extracting the same page again does not re-parse the document. On a cache hit the 
+    cached images are copied to the storage path. A `pymupdf.Document` is hashed only 
+    once, and only documents opened with `read_document` are cached; the cache is 
+    bypassed for documents with unsaved changes or whose file has changed on disk 
+    since it was opened.
 
     Parameters:
     -----------
-    reader : PdfReader
-        The `PdfReader` object representing the PDF document.
+    reader : pymupdf.Document
+        The `pymupdf.Document` object representing the PDF document.
     page_number : int
         The page number to extract text and images from (1-based index).
     storage_path: Path
         the path to where to where the images will be store
+    force_refresh : bool, optional
+        Ignore any cached result and extract the page again. Defaults to `False`.
+    extract_images : bool, optional
+        Extract and save the page's images. When `False`, only the text is extracted 
+        and the returned image list is empty. Defaults to `True`.
 
     Returns:
     --------
@@ -190,7 +446,7 @@ def extract_data_from_page(reader: PdfReader | Path, page_number: int, storage_p
 
     Examples:
     ---------
-    >>> reader = PdfReader("example.pdf")
+    >>> reader = read_document(Path("example.pdf"))
     >>> extract_text_from_page(reader, 1)
     (
         'Extracted text from page 1',
@@ -206,28 +462,586 @@ def extract_data_from_page(reader: PdfReader | Path, page_number: int, storage_p
         }
     )
     """
-    page_number -= 1  # Convert to 0-based index
+    if page_number < 1:
+        raise ValueError("Page number should be greater than 0")
+
+    digest = _document_cache_digest(reader)
+    if digest is not None and not force_refresh:
+        cached = _load_cached_page(digest, page_number, storage_path, extract_images)
+        if cached is not None:
+            return cached
+
+    return _extract_and_cache_page(reader, digest, page_number, storage_path, extract_images)
+
+
 
-    if page_number < 0:
+@extract_data_from_page.register(Path)
+@extract_data_from_page.register(str)
+def _extract_data_from_page_path(reader: Path | str, page_number: int, storage_path: Path =  Path('./images'), force_refresh: bool = False, extract_images: bool = True):
+    if page_number < 1:
         raise ValueError("Page number should be greater than 0")
+
+    document_path, st = _stat_document(reader)
+    digest = _safe_document_digest(document_path, st.st_size)
+    if digest is not None and not force_refresh:
+        cached = _load_cached_page(digest, page_number, storage_path, extract_images)
+        if cached is not None:
+            return cached
+
+    reader = _open_document(document_path, st)
     if reader is None:
         return None
-    
-    if isinstance(reader, Path):
-        reader = read_document(reader)
+    # The file may have been replaced between hashing and opening it.
+    if digest is not None and not _file_unchanged(document_path, st):
+        digest = None
+    with reader:
+        return _extract_and_cache_page(reader, digest, page_number, storage_path, extract_images)
+
+
+
+@extract_data_from_page.register(type(None))
+def _extract_data_from_page_none(reader: None, page_number: int, storage_path: Path =  Path('./images'), force_refresh: bool = False, extract_images: bool = True):
+    if page_number < 1:
+        raise ValueError("Page number should be greater than 0")
+    return None
+
+
+
+def _extract_and_cache_page(reader: pymupdf.Document, digest: str | None, page_number: int, storage_path: Path, extract_images: bool):
+    """
+    Extract one page of an opened document and store the result in the cache.
 
+    Returns `None` if the page cannot be extracted; nothing is cached when `digest` is `None`.
+    """
     meta_data = get_document_meta_data(reader)
-    meta_data['page'] = page_number + 1
     try:
-        page = reader.pages[page_number]
-        text = page.extract_text()
-        images = extract_image(page, storage_path)
+        result = _extract_page(reader, page_number, meta_data, storage_path, extract_images)
     except Exception as e:
         print(f"Error extracting text: {e}")
         return None
-    
-    return text, images, meta_data
 
+    if digest is not None:
+        _store_cached_page(digest, page_number, result, extract_images)
+    return result
+
+
+
+def _extract_page(reader: pymupdf.Document, page_number: int, base_meta: dict, storage_path: Path, extract_images: bool = True) -> tuple:
+    """
+    Extract text and images from one page (1-based index) of an already opened document.
+
+    `base_meta` is the document metadata computed once by the caller; the returned
+    metadata is a copy of it with the page number added. Images are skipped entirely 
+    when `extract_images` is `False`.
+    """
+    page = reader.load_page(page_number - 1)
+    text = page.get_text()
+    images = extract_image(page, storage_path) if extract_images else []
+    return text, images, {**base_meta, 'page': page_number}
+
+
+
+def extract_data(document_path: Path | str, page_numbers: list[int], storage_path: Path = Path('./images'), force_refresh: bool = False, extract_images: bool = True):
+    """
+    Extract text and images from several pages of a PDF document.
+
+    This function opens the document and computes its metadata at most once, however 
+    many pages are requested, instead of once per page as repeated calls to 
+    `extract_data_from_page` with a path would. It shares the on-disk cache with 
+    `extract_data_from_page`: the document is hashed once, and it is only opened if 
+    at least one page is not cached.
+
+    Parameters:
+    -----------
+    document_path : Path or str
+        The path to the document.
+    page_numbers : list of int
+        The page numbers to extract (1-based index).
+    storage_path : Path, optional
+        The directory where extracted images will be saved.
+    force_refresh : bool, optional
+        Ignore any cached result and extract the pages again. Defaults to `False`.
+    extract_images : bool, optional
+        Extract and save the pages' images. Defaults to `True`.
+
+    Returns:
+    --------
+    list or None
+        A list with one `(text, images, meta_data)` tuple per requested page, in the 
+        order of `page_numbers`, or `None` for pages that could not be extracted. 
+        Returns `None` if the document cannot be read.
+
+    Raises:
+    -------
+    FileNotFoundError
+        If the file does not exist at the specified path.
+    ValueError
+        If any page number is less than 1.
+
+    Examples:
+    ---------
+    >>> extract_data(Path("example.pdf"), [1, 2])
+    [
+        ('Extracted text from page 1', [...], {..., 'page': 1}),
+        ('Extracted text from page 2', [...], {..., 'page': 2})
+    ]
+    """
+    document_path, st = _stat_document(document_path)
+    page_numbers = list(page_numbers)
+    if any(page_number < 1 for page_number in page_numbers):
+        raise ValueError("Page number should be greater than 0")
+
+    digest = _safe_document_digest(document_path, st.st_size)
+    reader = None
+    results = []
+    try:
+        for page_number in page_numbers:
+            result = None
+            if digest is not None and not force_refresh:
+                result = _load_cached_page(digest, page_number, storage_path, extract_images)
+            if result is None:
+                if reader is None:
+                    reader = _open_document(document_path, st)
+                    if reader is None:
+                        return None
+                    # The file may have been replaced between hashing and opening it.
+                    if digest is not None and not _file_unchanged(document_path, st):
+                        digest = None
+                    base_meta = get_document_meta_data(reader)
+                try:
+                    result = _extract_page(reader, page_number, base_meta, storage_path, extract_images)
+                except Exception as e:
+                    print(f"Error extracting text: {e}")
+                else:
+                    if digest is not None:
+                        _store_cached_page(digest, page_number, result, extract_images)
+            results.append(result)
+    finally:
+        if reader is not None:
+            reader.close()
+
+    return results
+
+
+
+def extract_data_soa(reader: pymupdf.Document, page_numbers: list[int], storage_path: Path = Path('./images'), extract_images: bool = True) -> dict:
+    """
+    Extract text and images from several pages, returned column by column.
+
+    Instead of one `(text, images, meta_data)` tuple per page, this function returns one
+    list per field, which is the layout indexing and embedding pipelines usually want: 
+    `texts` can be handed to a tokenizer as is. The document metadata, which is the 
+    same for every page, is returned once as `base_meta` instead of being copied into 
+    each page's metadata; the metadata of page `i` is `{**base_meta, 'page': page_numbers[i]}`.
+
+    Parameters:
+    -----------
+    reader : pymupdf.Document
+        The `pymupdf.Document` object representing the PDF document.
+    page_numbers : list of int
+        The page numbers to extract (1-based index).
+    storage_path : Path, optional
+        The directory where extracted images will be saved.
+    extract_images : bool, optional
+        Extract and save the pages' images. Defaults to `True`.
+
+    Returns:
+    --------
+    dict
+        A dictionary containing:
+        - base_meta (dict): The document's metadata, without a page number.
+        - page_numbers (list): The requested page numbers.
+        - texts (list): The extracted text of each page, or `None` if the page could not be extracted.
+        - images (list): The list of saved images of each page, or `None` if the page could not be extracted.
+
+    Raises:
+    -------
+    ValueError
+        If any page number is less than 1.
+
+    Examples:
+    ---------
+    >>> reader = read_document(Path("example.pdf"))
+    >>> extract_data_soa(reader, [1, 2])
+    {
+        'base_meta': {'num_pages': 10, 'title': 'Example Title', ...},
+        'page_numbers': [1, 2],
+        'texts': ['Extracted text from page 1', 'Extracted text from page 2'],
+        'images': [[PosixPath('images/1_0_Im1.png')], []]
+    }
+    """
+    page_numbers = list(page_numbers)
+    if any(page_number < 1 for page_number in page_numbers):
+        raise ValueError("Page number should be greater than 0")
+
+    texts = []
+    images = []
+    for page_number in page_numbers:
+        try:
+            page = reader.load_page(page_number - 1)
+            text = page.get_text()
+            page_images = extract_image(page, storage_path) if extract_images else []
+        except Exception as e:
+            print(f"Error extracting text: {e}")
+            text = page_images = None
+        texts.append(text)
+        images.append(page_images)
+
+    return {
+        'base_meta': get_document_meta_data(reader),
+        'page_numbers': page_numbers,
+        'texts': texts,
+        'images': images,
+    }
+
+
+
+def _init_page_worker(cache_dir: str):
+    """
+    Point a worker process at the parent's cache directory.
+    """
+    global _cache_dir
+    _cache_dir = Path(cache_dir)
+
+
+
+def _extract_page_worker(document_path: str, digest: str | None, identity: tuple, page_number: int, storage_path: str, extract_images: bool):
+    """
+    Extract a single page in a worker process.
+
+    The parent hashes the document once and passes the digest along, so a worker looks
+    the page up in the cache before opening anything. Documents cannot be pickled, so 
+    on a miss the worker re-opens the PDF from its path, extracts the page, and closes 
+    it again. If the file was replaced after the parent hashed it, the result is not 
+    cached under the stale digest.
+    """
+    storage_path = Path(storage_path)
+    if digest is not None:
+        cached = _load_cached_page(digest, page_number, storage_path, extract_images)
+        if cached is not None:
+            return cached
+
+    reader = read_document(Path(document_path))
+    if reader is None:
+        return None
+    with reader:
+        if reader._docproc_identity != identity:
+            digest = None
+        return _extract_and_cache_page(reader, digest, page_number, storage_path, extract_images)
+
+
+
+def extract_data_from_pages(document_path: Path | str, page_numbers: list[int], storage_path: Path = Path('./images'), workers: int | None = None, extract_images: bool = True):
+    """
+    Extract text and images from several pages of a PDF document in parallel.
+
+    This function fans the requested pages out to a pool of worker processes, each of 
+    which extracts one page, using the on-disk cache shared with `extract_data_from_page`. 
+    The document is hashed once, here, rather than in every worker. Processes are used 
+    rather than threads because text and image extraction are CPU-bound and would 
+    otherwise be serialized by the GIL. Each distinct page is extracted once, so no two 
+    workers write the same image files; results are returned in the same order as 
+    `page_numbers`. Workers are started with the "forkserver" method where available, 
+    and "spawn" otherwise, rather than forked from the calling process; as with any 
+    such pool, scripts calling this function need an `if __name__ == '__main__':` guard.
+
+    Parameters:
+    -----------
+    document_path : Path or str
+        The path to the document.
+    page_numbers : list of int
+        The page numbers to extract (1-based index).
+    storage_path : Path, optional
+        The directory where extracted images will be saved.
+    workers : int, optional
+        The number of worker processes. Defaults to the number of CPUs, capped at 4.
+    extract_images : bool, optional
+        Extract and save the pages' images. Defaults to `True`.
+
+    Returns:
+    --------
+    list
+        A list with one `(text, images, meta_data)` tuple per requested page, as returned 
+        by `extract_data_from_page`, or `None` for pages that could not be extracted.
+
+    Raises:
+    -------
+    FileNotFoundError
+        If the file does not exist at the specified path.
+    ValueError
+        If any page number is less than 1.
+
+    Examples:
+    ---------
+    >>> extract_data_from_pages(Path("example.pdf"), [1, 2, 3])
+    [
+        ('Extracted text from page 1', [...], {..., 'page': 1}),
+        ('Extracted text from page 2', [...], {..., 'page': 2}),
+        ('Extracted text from page 3', [...], {..., 'page': 3})
+    ]
+    """
+    document_path, st = _stat_document(document_path)
+    page_numbers = list(page_numbers)
+    if any(page_number < 1 for page_number in page_numbers):
+        raise ValueError("Page number should be greater than 0")
+    if workers is None:
+        workers = min(os.cpu_count() or 1, 4)
+
+    digest = _safe_document_digest(document_path, st.st_size)
+    distinct_pages = list(dict.fromkeys(page_numbers))
+    # Forking a parent that runs threads (the shared I/O pool, a caller's own threads) 
+    # can copy locks in a held state into the children, so workers are started fresh.
+    start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context(start_method),
+        initializer=_init_page_worker,
+        initargs=(str(_cache_dir),),
+    ) as executor:
+        results = dict(zip(distinct_pages, executor.map(
+            _extract_page_worker,
+            repeat(str(document_path)),
+            repeat(digest),
+            repeat(_file_identity(st)),
+            distinct_pages,
+            repeat(str(storage_path)),
+            repeat(extract_images),
+        )))
+    return [results[page_number] for page_number in page_numbers]
+
+
+
+
+def _pipeline_put(stage_queue: queue.Queue, item, stop: threading.Event) -> bool:
+    """
+    Put an item on a bounded pipeline queue, giving up if the pipeline is stopped.
+    """
+    while not stop.is_set():
+        try:
+            stage_queue.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+
+def _pipeline_get(stage_queue: queue.Queue, stop: threading.Event):
+    """
+    Get an item from a pipeline queue, returning the done marker if the pipeline is stopped.
+    """
+    while not stop.is_set():
+        try:
+            return stage_queue.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return _PIPELINE_DONE
+
+
+
+def extract_pages_pipelined(reader: pymupdf.Document, page_numbers: list[int], storage_path: Path = Path('./images')):
+    """
+    Extract text and images from several pages, overlapping extraction with disk writes.
+
+    This generator runs two stages on their own threads, connected by bounded queues:
+    the first loads each page and extracts its text and image bytes, the second writes 
+    the image bytes to the storage path. Writing the images of one page therefore 
+    overlaps with extracting the next one. The bounded queues apply backpressure so 
+    that no more than a few pages are held in memory at once. Page loading and text 
+    extraction share a single stage because a `pymupdf.Document` must not be used 
+    from several threads at the same time; for the same reason the caller must not 
+    use `reader` until the generator is exhausted or closed.
+
+    Parameters:
+    -----------
+    reader : pymupdf.Document
+        The `pymupdf.Document` object representing the PDF document.
+    page_numbers : list of int
+        The page numbers to extract (1-based index).
+    storage_path : Path, optional
+        The directory where extracted images will be saved.
+
+    Yields:
+    -------
+    tuple or None
+        A `(text, images, meta_data)` tuple per requested page, in the order of 
+        `page_numbers`, or `None` for pages that could not be extracted.
+
+    Raises:
+    -------
+    ValueError
+        If any page number is less than 1.
+
+    Examples:
+    ---------
+    >>> reader = read_document(Path("example.pdf"))
+    >>> for text, images, meta_data in extract_pages_pipelined(reader, [1, 2, 3]):
+    ...     print(meta_data['page'], len(images))
+    1 2
+    2 0
+    3 1
+    """
+    page_numbers = list(page_numbers)
+    if any(page_number < 1 for page_number in page_numbers):
+        raise ValueError("Page number should be greater than 0")
+
+    meta_data = get_document_meta_data(reader)
+    write_queue = queue.Queue(maxsize=_PIPELINE_QUEUE_SIZE)
+    result_queue = queue.Queue(maxsize=_PIPELINE_QUEUE_SIZE)
+    stop = threading.Event()
+
+    def extract_stage():
+        for page_number in page_numbers:
+            try:
+                page = reader.load_page(page_number - 1)
+                item = (page.get_text(), _read_images(page), {**meta_data, 'page': page_number})
+            except Exception as e:
+                print(f"Error extracting text: {e}")
+                item = None
+            if not _pipeline_put(write_queue, item, stop):
+                return
+        _pipeline_put(write_queue, _PIPELINE_DONE, stop)
+
+    def write_stage():
+        while True:
+            item = _pipeline_get(write_queue, stop)
+            if item is not None and item is not _PIPELINE_DONE:
+                text, images, page_meta_data = item
+                try:
+                    item = (text, _write_images(images, storage_path), page_meta_data)
+                except Exception as e:
+                    print(f"Error extracting text: {e}")
+                    item = None
+            if not _pipeline_put(result_queue, item, stop) or item is _PIPELINE_DONE:
+                return
+
+    threads = [
+        threading.Thread(target=extract_stage, daemon=True),
+        threading.Thread(target=write_stage, daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        while True:
+            item = result_queue.get()
+            if item is _PIPELINE_DONE:
+                return
+            yield item
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+
+async def aiter_image_batches(document_path: Path | str, page_numbers: list[int] | None = None, n: int = 16, timeout: float = 0.05):
+    """
+    Asynchronously yield the embedded images of a PDF document in batches.
+
+    This async generator is meant for feeding downstream OCR or vision models, which 
+    work best on groups of images rather than one at a time. A thread opens the 
+    document and pushes the raw bytes of every image of the requested pages onto a 
+    bounded queue, which applies backpressure when the consumer falls behind. A batch 
+    is released as soon as it holds `n` images, or once `timeout` seconds have passed 
+    since the last batch was released, whichever happens first; an incomplete batch 
+    is released at the end. Images are not written to disk.
+
+    Parameters:
+    -----------
+    document_path : Path or str
+        The path to the document.
+    page_numbers : list of int, optional
+        The page numbers to read images from (1-based index). Defaults to all pages.
+    n : int, optional
+        The maximum number of images per batch. Defaults to 16.
+    timeout : float, optional
+        The longest time, in seconds, to wait before releasing a non-empty batch. 
+        Defaults to 0.05.
+
+    Yields:
+    -------
+    list
+        A list of `(image_bytes, page_number)` tuples, in page order.
+
+    Raises:
+    -------
+    FileNotFoundError
+        If the file does not exist at the specified path.
+    ValueError
+        If any page number is less than 1.
+
+    Examples:
+    ---------
+    >>> async for batch in aiter_image_batches(Path("example.pdf"), n=8):
+    ...     print([page_number for _, page_number in batch])
+    [1, 1, 2, 3, 3, 3, 4, 4]
+    [5, 6]
+    """
+    document_path, st = _stat_document(document_path)
+    if page_numbers is not None:
+        page_numbers = list(page_numbers)
+        if any(page_number < 1 for page_number in page_numbers):
+            raise ValueError("Page number should be greater than 0")
+
+    loop = asyncio.get_running_loop()
+    image_queue = asyncio.Queue(maxsize=_IMAGE_QUEUE_SIZE)
+    stop = threading.Event()
+
+    def put(item):
+        asyncio.run_coroutine_threadsafe(image_queue.put(item), loop).result()
+
+    def produce():
+        try:
+            reader = _open_document(document_path, st)
+            if reader is None:
+                return
+            with reader:
+                if page_numbers is None:
+                    pages = range(1, reader.page_count + 1)
+                else:
+                    pages = page_numbers
+                for page_number in pages:
+                    try:
+                        images = _read_images(reader.load_page(page_number - 1))
+                    except Exception as e:
+                        print(f"Error extracting image: {e}")
+                        continue
+                    for _, data in images:
+                        if stop.is_set():
+                            return
+                        put((data, page_number))
+        finally:
+            if not stop.is_set():
+                put(_PIPELINE_DONE)
+
+    producer = asyncio.ensure_future(asyncio.to_thread(produce))
+    try:
+        batch = []
+        deadline = loop.time() + timeout
+        while True:
+            try:
+                item = await asyncio.wait_for(image_queue.get(), max(deadline - loop.time(), 0))
+            except asyncio.TimeoutError:
+                item = None
+            if item is _PIPELINE_DONE:
+                break
+            if item is not None:
+                batch.append(item)
+            if len(batch) >= n or loop.time() >= deadline:
+                if batch:
+                    yield batch
+                    batch = []
+                deadline = loop.time() + timeout
+        if batch:
+            yield batch
+        await producer
+    finally:
+        stop.set()
+        # Unblock a producer waiting on a full queue so that it can see the stop flag.
+        while not image_queue.empty():
+            image_queue.get_nowait()
+        await asyncio.gather(producer, return_exceptions=True)
 
 
 
@@ -236,13 +1050,13 @@ def extract_image(page, storage_path: Path = Path(__file__).parent):
     Extract images from a PDF page and save them to a specified storage path.
 
     This function takes a PDF page object and extracts all images from the page, saving
-    them to the specified storage path. Each image is saved with a unique filename 
-    generated using a counter. If an error occurs during the extraction, it raises an 
-    `ImageExtractionError`.
+    them to the specified storage path, which is created if it does not exist yet. Each 
+    image is saved with a unique filename generated from the page number and a counter. 
+    If an error occurs during the extraction, it raises an `ImageExtractionError`.
 
     Parameters:
     -----------
-    page : PdfPage
+    page : pymupdf.Page
         The PDF page object from which images will be extracted.
     storage_path : Path, optional
         The directory where extracted images will be saved. Defaults to the directory 
@@ -260,25 +1074,144 @@ def extract_image(page, storage_path: Path = Path(__file__).parent):
 
     Examples:
     ---------
-    >>> page = reader.pages[0]
+    >>> page = reader.load_page(0)
     >>> extract_image(page, Path('./images'))
-    [PosixPath('images/0image1.png'), PosixPath('images/1image2.png')]
+    [PosixPath('images/1_0_Im1.png'), PosixPath('images/1_1_Im2.png')]
     """
-    count = 0
-    images = []
-    for image_file_object in page.images:
-        image_path = storage_path / f"{count}_{image_file_object.name}"
+    return _write_images(_read_images(page), storage_path)
+
+
+
+def iter_extract_image(page, storage_path: Path = Path(__file__).parent) -> Iterator[Path]:
+    """
+    Extract images from a PDF page one at a time, yielding each path once it is saved.
+
+    This is the streaming counterpart of `extract_image`: each image is read, written 
+    and released before the next one is read, so only one decoded image is held in 
+    memory at a time and callers can hash or upload images as they are produced. 
+    `extract_image` remains the faster choice when all paths are needed anyway, since 
+    it submits the writes of a page as one batch.
+
+    Parameters:
+    -----------
+    page : pymupdf.Page
+        The PDF page object from which images will be extracted.
+    storage_path : Path, optional
+        The directory where extracted images will be saved. Defaults to the directory 
+        of the current script.
+
+    Yields:
+    -------
+    Path
+        The path to each saved image, in the same order as `extract_image`.
+
+    Raises:
+    -------
+    ImageExtractionError
+        If an error occurs while extracting and saving an image.
+
+    Examples:
+    ---------
+    >>> page = reader.load_page(0)
+    >>> for image_path in iter_extract_image(page, Path('./images')):
+    ...     upload(image_path)
+    """
+    # The images are read here rather than through `_iter_read_images`, whose suspended 
+    # frame would keep the last image alive while the caller handles its path.
+    document = page.parent
+    page_prefix = f"{page.number + 1}_"
+    storage_path_created = False
+    for count, image_info in enumerate(page.get_images(full=True)):
+        xref, name = image_info[0], image_info[7]
+        try:
+            image = document.extract_image(xref)
+            image_path = storage_path / f"{page_prefix}{count}_{name}.{image['ext']}"
+            if not storage_path_created:
+                storage_path.mkdir(parents=True, exist_ok=True)
+                storage_path_created = True
+            _write_image(os.fspath(image_path), image['image'])
+        except Exception as e:
+            raise ImageExtractionError(f"Error extracting image: {e}")
+        del image
+        yield image_path
+
+
+
+def _iter_read_images(page) -> Iterator[tuple[str, bytes]]:
+    """
+    Read the embedded images of a PDF page one at a time.
+
+    Yields `(file_name, data)` tuples, where `file_name` is built from the page number
+    (1-based), a counter, the image's resource name and its original format extension. 
+    Resource names repeat across pages, so the page number keeps the images of 
+    different pages from overwriting each other in a shared storage path.
+    """
+    document = page.parent
+    page_prefix = f"{page.number + 1}_"
+    for count, image_info in enumerate(page.get_images(full=True)):
+        xref, name = image_info[0], image_info[7]
 
         try:
-            with open(image_path, "wb") as fp:
-                fp.write(image_file_object.data)
-                images.append(image_path)
-                count += 1
+            image = document.extract_image(xref)
         except Exception as e:
             raise ImageExtractionError(f"Error extracting image: {e}")
+        yield f"{page_prefix}{count}_{name}.{image['ext']}", image['image']
+
+
+
+def _read_images(page) -> list[tuple[str, bytes]]:
+    """
+    Read the embedded images of a PDF page into memory.
+
+    Returns a list of `(file_name, data)` tuples, as yielded by `_iter_read_images`.
+    """
+    return list(_iter_read_images(page))
+
+
+
+def _write_image(image_path: str, data: bytes):
+    """
+    Write a single image to disk.
+
+    The image is already held in memory as one `bytes` object, so it is written with 
+    `os.write` on a raw file descriptor rather than through a buffered file object. 
+    Short writes are continued from a `memoryview`, so no partial copy of the image 
+    is ever made.
+    """
+    fd = os.open(image_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        remaining = memoryview(data)
+        while remaining:
+            remaining = remaining[os.write(fd, remaining):]
+    finally:
+        os.close(fd)
 
-    return images
 
 
+def _write_images(images: list[tuple[str, bytes]], storage_path: Path) -> list[Path]:
+    """
+    Write images read by `_read_images` to the storage path.
+
+    When a page holds more than one image, all writes are submitted at once to a shared
+    thread pool so that several of them are in flight together and device latency is 
+    paid once per batch rather than once per image; file writes release the GIL, so 
+    the threads do overlap. The writes use plain string paths built from a prefix 
+    computed once, which `os.open` takes without an `os.fspath` round trip. Returns the 
+    list of `Path` objects the images were written to, in the order of `images`.
+    """
+    if not images:
+        return []
 
+    prefix = os.path.join(os.fspath(storage_path), "")
+    targets = [prefix + file_name for file_name, _ in images]
+    try:
+        storage_path.mkdir(parents=True, exist_ok=True)
+        if len(images) > 1:
+            for _ in _get_io_executor().map(_write_image, targets, [data for _, data in images]):
+                pass
+        else:
+            _write_image(targets[0], images[0][1])
+    except Exception as e:
+        raise ImageExtractionError(f"Error extracting image: {e}")
 
+    return [storage_path / file_name for file_name, _ in images]
@@ -17,7 +17,8 @@ setup(
     ],
     python_requires='>=3.6',
     install_requires=[
-        'PyPDF2',  # Add your required packages here
+        'pymupdf>=1.24.3',  # Add your required packages here
         'pillow',
+        'blake3',
     ],
 )
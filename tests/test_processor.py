@@ -0,0 +1,166 @@
+import asyncio
+import os
+import threading
+from pathlib import Path
+
+import pymupdf
+import pytest
+
+from document_processor import processor
+
+
+def make_pdf(path: Path, texts: list[str], images_per_page: int = 1) -> Path:
+    """
+    Write a PDF with one page per text, each holding the text and some small images.
+    """
+    document = pymupdf.open()
+    for page_index, text in enumerate(texts):
+        page = document.new_page()
+        page.insert_text((50, 50), text)
+        for count in range(images_per_page):
+            pixmap = pymupdf.Pixmap(pymupdf.csRGB, pymupdf.IRect(0, 0, 8, 8), False)
+            pixmap.clear_with((page_index * 16 + count * 8) % 256)
+            page.insert_image(pymupdf.Rect(10 * count, 100, 10 * count + 8, 108), pixmap=pixmap)
+    # Replace the file rather than rewriting it in place, as editors and exporters do.
+    tmp_path = path.with_suffix('.tmp')
+    document.save(tmp_path)
+    document.close()
+    os.replace(tmp_path, path)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    cache_dir = tmp_path / 'cache'
+    monkeypatch.setattr(processor, '_cache_dir', cache_dir)
+    return cache_dir
+
+
+@pytest.fixture
+def pdf(tmp_path):
+    return make_pdf(tmp_path / 'example.pdf', ['page one', 'page two', 'page three'])
+
+
+@pytest.fixture
+def count_extractions(monkeypatch):
+    calls = []
+    extract_page = processor._extract_page
+
+    def counting_extract_page(reader, page_number, *args, **kwargs):
+        calls.append(page_number)
+        return extract_page(reader, page_number, *args, **kwargs)
+
+    monkeypatch.setattr(processor, '_extract_page', counting_extract_page)
+    return calls
+
+
+def test_cache_miss_then_hit(pdf, tmp_path, cache_dir, count_extractions):
+    text, images, meta_data = processor.extract_data_from_page(pdf, 2, tmp_path / 'first')
+    assert 'page two' in text
+    assert meta_data['page'] == 2
+    assert [image.parent for image in images] == [tmp_path / 'first']
+    assert count_extractions == [2]
+    assert list(cache_dir.glob('*/2.json'))
+
+    cached = processor.extract_data_from_page(pdf, 2, tmp_path / 'second')
+    assert count_extractions == [2]
+    assert cached[0] == text
+    assert cached[2] == meta_data
+    assert [image.name for image in cached[1]] == [image.name for image in images]
+    assert all(image.parent == tmp_path / 'second' and image.exists() for image in cached[1])
+
+
+def test_cache_hit_for_opened_document(pdf, tmp_path, count_extractions):
+    reader = processor.read_document(pdf)
+    with reader:
+        first = processor.extract_data_from_page(reader, 1, tmp_path / 'images')
+        second = processor.extract_data_from_page(reader, 1, tmp_path / 'images')
+    assert count_extractions == [1]
+    assert first[0] == second[0]
+
+
+def test_force_refresh(pdf, tmp_path, count_extractions):
+    processor.extract_data_from_page(pdf, 1, tmp_path / 'images')
+    processor.extract_data_from_page(pdf, 1, tmp_path / 'images', force_refresh=True)
+    assert count_extractions == [1, 1]
+    processor.extract_data_from_page(pdf, 1, tmp_path / 'images')
+    assert count_extractions == [1, 1]
+
+
+def test_text_only_entry_is_a_miss_for_images(pdf, tmp_path, count_extractions):
+    text, images, _ = processor.extract_data_from_page(pdf, 1, tmp_path / 'images', extract_images=False)
+    assert images == []
+    assert not (tmp_path / 'images').exists()
+
+    text_again, images, _ = processor.extract_data_from_page(pdf, 1, tmp_path / 'images')
+    assert count_extractions == [1, 1]
+    assert text_again == text
+    assert len(images) == 1 and images[0].exists()
+
+
+def test_image_entry_serves_text_only_requests(pdf, tmp_path, count_extractions):
+    processor.extract_data_from_page(pdf, 1, tmp_path / 'images')
+    text, images, _ = processor.extract_data_from_page(pdf, 1, tmp_path / 'other', extract_images=False)
+    assert count_extractions == [1]
+    assert 'page one' in text
+    assert images == []
+    assert not (tmp_path / 'other').exists()
+
+
+def test_rewritten_file_invalidates_cache(pdf, tmp_path, count_extractions):
+    text, _, _ = processor.extract_data_from_page(pdf, 1, tmp_path / 'images')
+    assert 'page one' in text
+
+    make_pdf(pdf, ['rewritten page', 'page two', 'page three'])
+    text, _, _ = processor.extract_data_from_page(pdf, 1, tmp_path / 'images')
+    assert 'rewritten page' in text
+    assert count_extractions == [1, 1]
+
+
+def test_rewritten_file_is_not_cached_through_stale_document(pdf, tmp_path, cache_dir):
+    reader = processor.read_document(pdf)
+    with reader:
+        make_pdf(pdf, ['rewritten page', 'page two', 'page three'])
+        text, _, _ = processor.extract_data_from_page(reader, 1, tmp_path / 'images')
+    assert 'page one' in text
+    assert not list(cache_dir.glob('*/1.json'))
+
+
+def test_extract_data_preserves_order(pdf, tmp_path):
+    results = processor.extract_data(pdf, [3, 1, 2], tmp_path / 'images')
+    assert [meta_data['page'] for _, _, meta_data in results] == [3, 1, 2]
+    assert 'page three' in results[0][0]
+    assert 'page one' in results[1][0]
+
+
+def test_extract_data_from_pages_preserves_order(pdf, tmp_path, cache_dir):
+    page_numbers = [3, 1, 3, 2]
+    results = processor.extract_data_from_pages(pdf, page_numbers, tmp_path / 'images', workers=2)
+    assert [meta_data['page'] for _, _, meta_data in results] == page_numbers
+    assert ['page three' in text for text, _, _ in results] == [True, False, True, False]
+    # Workers use the cache directory of the parent process.
+    assert sorted(path.name for path in cache_dir.glob('*/*.json')) == ['1.json', '2.json', '3.json']
+
+
+def test_extract_pages_pipelined_preserves_order(pdf, tmp_path):
+    page_numbers = [2, 3, 1, 2]
+    with processor.read_document(pdf) as reader:
+        results = list(processor.extract_pages_pipelined(reader, page_numbers, tmp_path / 'images'))
+    assert [meta_data['page'] for _, _, meta_data in results] == page_numbers
+    assert all(len(images) == 1 and images[0].exists() for _, images, _ in results)
+
+
+def test_aiter_image_batches_early_aclose(tmp_path):
+    # Enough images to fill the queue, so that the producer is blocked when closed.
+    pdf = make_pdf(tmp_path / 'images.pdf', ['page'] * 8, images_per_page=8)
+
+    async def take_first_batch():
+        batches = processor.aiter_image_batches(pdf, n=4, timeout=1)
+        batch = await batches.__anext__()
+        await asyncio.wait_for(batches.aclose(), timeout=5)
+        return batch
+
+    threads = threading.active_count()
+    batch = asyncio.run(take_first_batch())
+    assert [page_number for _, page_number in batch] == [1, 1, 1, 1]
+    assert threading.active_count() == threads